@@ -1,6 +1,12 @@
 import os
+import re
+import asyncio
+import hashlib
+import threading
+from collections import OrderedDict
 from dotenv import load_dotenv
 import google.generativeai as genai
+from google.generativeai import client as genai_client
 
 # Load environment variables from .env file if present
 load_dotenv()
@@ -9,17 +15,123 @@ API_KEY = os.getenv("GOOGLE_API_KEY")
 if not API_KEY:
     raise RuntimeError("Missing GOOGLE_API_KEY environment variable.")
 
-genai.configure(api_key=API_KEY)
+# "grpc" keeps one long-lived HTTP/2 channel; "rest" reuses a pooled requests session
+GEMINI_TRANSPORT = os.getenv("GEMINI_TRANSPORT", "grpc")
+
+genai.configure(api_key=API_KEY, transport=GEMINI_TRANSPORT)
 MODEL_NAME = "gemini-1.5-flash"  # Change to "gemini-1.5-pro" for higher quality, fewer free requests
+CACHE_MAXSIZE = 4096  # Max memoized prompts kept in memory
+MAX_CONCURRENT_REQUESTS = int(os.getenv("GEMINI_MAX_CONCURRENT_REQUESTS", "8"))  # Stay under free-tier rate limits
+
+API_ERROR_PREFIX = "Gemini API Error: "  # Starts every failed answer, so callers can tell it apart
+
+_BATCH_ANSWER_RE = re.compile(r"^---ANSWER (\d+)---[ \t]*$", re.MULTILINE)
 
 model = genai.GenerativeModel(MODEL_NAME)
+# Build the shared client up front so concurrent first calls (analyzer threads,
+# chat requests) reuse one connection instead of racing to open their own
+genai_client.get_default_generative_client()
 
 class GeminiModelInstance:
+    def __init__(self, cache_maxsize: int = CACHE_MAXSIZE):
+        self._cache = OrderedDict()
+        self._cache_maxsize = cache_maxsize
+        self._cache_lock = threading.Lock()
+        self._async_limit = asyncio.Semaphore(MAX_CONCURRENT_REQUESTS)
+
+    @staticmethod
+    def _cache_key(prompt):
+        return hashlib.blake2b(prompt.encode("utf-8"), digest_size=16).digest()
+
+    def _cache_get(self, key):
+        with self._cache_lock:
+            if key not in self._cache:
+                return None
+            self._cache.move_to_end(key)
+            return self._cache[key]
+
+    def _cache_put(self, key, value):
+        with self._cache_lock:
+            self._cache[key] = value
+            self._cache.move_to_end(key)
+            if len(self._cache) > self._cache_maxsize:
+                self._cache.popitem(last=False)
+
     def explain(self, prompt):
+        key = self._cache_key(prompt)
+        cached = self._cache_get(key)
+        if cached is not None:
+            return cached
         try:
             response = model.generate_content(prompt)
-            return response.text.strip() if hasattr(response, "text") else str(response).strip()
+            text = response.text.strip() if hasattr(response, "text") else str(response).strip()
         except Exception as e:
-            return f"Gemini API Error: {e}"
+            # Errors are not cached so the next call retries the API
+            return f"{API_ERROR_PREFIX}{e}"
+        self._cache_put(key, text)
+        return text
+
+    async def explain_async(self, prompt):
+        """Non-blocking explain for use inside the event loop"""
+        key = self._cache_key(prompt)
+        cached = self._cache_get(key)
+        if cached is not None:
+            return cached
+        try:
+            async with self._async_limit:
+                response = await model.generate_content_async(prompt)
+            text = response.text.strip() if hasattr(response, "text") else str(response).strip()
+        except Exception as e:
+            return f"{API_ERROR_PREFIX}{e}"
+        self._cache_put(key, text)
+        return text
+
+    def explain_batch(self, prompts):
+        """Answer several prompts with a single model request, in input order"""
+        answers = [None] * len(prompts)
+        pending = {}  # uncached prompt -> indices it answers
+        for i, prompt in enumerate(prompts):
+            cached = self._cache_get(self._cache_key(prompt))
+            if cached is not None:
+                answers[i] = cached
+            else:
+                pending.setdefault(prompt, []).append(i)
+
+        if len(pending) == 1:
+            (prompt, indices), = pending.items()
+            answer = self.explain(prompt)
+            for i in indices:
+                answers[i] = answer
+        elif pending:
+            unique_prompts = list(pending)
+            batch_prompt = (
+                "Answer each of the following requests independently.\n"
+                "Start the answer to request N with a line containing only ---ANSWER N--- "
+                "and write nothing outside those answer blocks.\n"
+                + "".join(f"\n---ISSUE {n}---\n{prompt}\n" for n, prompt in enumerate(unique_prompts, 1))
+            )
+            try:
+                response = model.generate_content(batch_prompt)
+                text = response.text if hasattr(response, "text") else str(response)
+            except Exception:
+                text = ""
+            parsed = self._split_batch_answers(text)
+
+            for n, prompt in enumerate(unique_prompts, 1):
+                answer = parsed.get(n)
+                if answer:
+                    self._cache_put(self._cache_key(prompt), answer)
+                else:
+                    # Malformed or missing block, fall back to a single request
+                    answer = self.explain(prompt)
+                for i in pending[prompt]:
+                    answers[i] = answer
+        return answers
+
+    @staticmethod
+    def _split_batch_answers(text):
+        parts = _BATCH_ANSWER_RE.split(text)
+        # parts is [preamble, number, body, number, body, ...]
+        return {int(number): body.strip() for number, body in zip(parts[1::2], parts[2::2]) if body.strip()}
 
-model_instance = GeminiModelInstance()
\ No newline at end of file
+model_instance = GeminiModelInstance()
@@ -6,17 +6,78 @@ import yaml
 import re
 import shlex
 import shutil
+import signal
+import functools
+import atexit
+import hashlib
+import threading
+import contextvars
+from collections import OrderedDict
 from contextlib import contextmanager
 from dataclasses import dataclass
-from typing import List, Dict, Optional, Union, Tuple
+from typing import List, Dict, Optional, Union, Tuple, Callable, Iterable, Iterator
 from concurrent.futures import ThreadPoolExecutor, as_completed
 import platform
 
-from app.ai_explanation import model_instance
+try:
+    import ahocorasick
+except ImportError:  # Optional accelerator; falls back to a linear scan
+    ahocorasick = None
+
+try:
+    import orjson
+except ImportError:  # Optional accelerator; falls back to stdlib json
+    orjson = None
+
+from app.ai_explanation import model_instance, API_ERROR_PREFIX
 from app.lint_explanations import LINT_EXPLANATIONS
 from app.error_lookup import COMMON_ERROR_EXPLANATIONS
 from app.doc_links import DOC_LINKS
 
+# libyaml-backed loader when PyYAML was built with it
+_YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+NO_SUMMARY_MESSAGE = "No meaningful summary could be generated for this file."
+
+# Set per analyze_and_explain call; counts tool and model failures that a retry might not hit
+_transient_failures: contextvars.ContextVar[Optional[List[str]]] = contextvars.ContextVar(
+    "_transient_failures", default=None
+)
+
+
+def _record_transient_failure(reason: str):
+    """Mark the current analysis as not cacheable"""
+    failures = _transient_failures.get()
+    if failures is not None:
+        failures.append(reason)
+
+
+def _build_error_matcher():
+    """Build an Aho-Corasick automaton over COMMON_ERROR_EXPLANATIONS keys"""
+    if ahocorasick is None or not COMMON_ERROR_EXPLANATIONS:
+        return None
+    automaton = ahocorasick.Automaton()
+    for priority, (key, explanation) in enumerate(COMMON_ERROR_EXPLANATIONS.items()):
+        automaton.add_word(key, (priority, explanation))
+    automaton.make_automaton()
+    return automaton
+
+
+_ERROR_MATCHER = _build_error_matcher()
+
+
+def lookup_error_explanation(error_message: str) -> Optional[str]:
+    """Return the explanation for the first COMMON_ERROR_EXPLANATIONS key found in the message"""
+    if _ERROR_MATCHER is None:
+        for key, explanation in COMMON_ERROR_EXPLANATIONS.items():
+            if key in error_message:
+                return explanation
+        return None
+    # Single pass over the message; dict order still decides between overlapping keys
+    match = min(_ERROR_MATCHER.iter(error_message), key=lambda hit: hit[1][0], default=None)
+    return match[1][1] if match else None
+
+
 class AnalysisError(Exception):
     """Base exception for analysis errors"""
     pass
@@ -37,9 +98,11 @@ class AnalysisConfig:
     """Configuration for code analysis"""
     timeout: int = 15
     max_code_snippet_length: int = 200
+    max_summary_length: int = 8000
     temp_dir: Optional[str] = None
-    enable_parallel_execution: bool = False
+    enable_parallel_execution: bool = True
     max_workers: int = 3
+    result_cache_size: int = 256
 
 
 @dataclass
@@ -84,27 +147,90 @@ class CommandRunner:
             raise ToolExecutionError(f"Command timed out after {self.timeout}s")
         except Exception as e:
             raise ToolExecutionError(f"Error running command: {e}")
+    
+    def run_command_lines(self, cmd: List[str]) -> Iterator[str]:
+        """Run a command and yield its combined stdout/stderr line by line"""
+        if not cmd or not all(isinstance(arg, str) for arg in cmd):
+            raise ToolExecutionError("Invalid command format")
+        
+        try:
+            proc = subprocess.Popen(
+                cmd,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.STDOUT,
+                text=True,
+                # Tools may print bytes that aren't valid UTF-8; never fail on them
+                encoding="utf-8",
+                errors="replace",
+                bufsize=1,
+                # Own process group so a timeout also kills children (e.g. gcc's cc1)
+                start_new_session=(os.name == "posix")
+            )
+        except Exception as e:
+            raise ToolExecutionError(f"Error running command: {e}")
+        
+        timed_out = threading.Event()
+        
+        def kill_on_timeout():
+            # A tool that already exited has not timed out, however slowly its output is consumed
+            if proc.poll() is None:
+                timed_out.set()
+                self._kill(proc)
+        
+        timer = threading.Timer(self.timeout, kill_on_timeout)
+        timer.start()
+        try:
+            try:
+                for line in proc.stdout:
+                    yield line.rstrip("\r\n")
+                proc.wait()
+            except (OSError, ValueError) as e:
+                # Reading the pipe failed; report it like any other tool failure
+                raise ToolExecutionError(f"Error reading command output: {e}")
+        finally:
+            timer.cancel()
+            proc.stdout.close()
+            if proc.poll() is None:
+                # Consumer stopped early, don't leave the tool running
+                self._kill(proc)
+                proc.wait()
+        
+        if timed_out.is_set():
+            raise ToolExecutionError(f"Command timed out after {self.timeout}s")
+    
+    @staticmethod
+    def _kill(proc: subprocess.Popen):
+        """Kill a process started by run_command_lines, including its children"""
+        try:
+            if os.name == "posix":
+                os.killpg(proc.pid, signal.SIGKILL)
+            else:
+                proc.kill()
+        except (ProcessLookupError, PermissionError):
+            pass  # Already exited
 
 
 class PathCleaner:
     """Handles cleaning of temporary paths from output"""
     
+    _WIN_TEMP_RE = re.compile(r"C:\\Users\\[^:]+\\AppData\\Local\\Temp\\")
+    _NIX_TEMP_RE = re.compile(r"/tmp/")
+    
     @staticmethod
     def clean_temp_paths(output: str, temp_path: str, display_name: str = "your_file") -> str:
         """Clean temporary file paths from tool output"""
         if not output or not temp_path:
             return output
         
-        temp_path_regex = re.escape(temp_path)
         base_temp = os.path.basename(temp_path)
         
-        # Replace full temp path
-        output = re.sub(temp_path_regex, display_name, output)
+        # Replace full temp path (literal match, no regex needed)
+        output = output.replace(temp_path, display_name)
         # Replace just the filename
-        output = re.sub(re.escape(base_temp), display_name, output)
+        output = output.replace(base_temp, display_name)
         # Clean system temp directories
-        output = re.sub(r"C:\\Users\\[^:]+\\AppData\\Local\\Temp\\", "", output)
-        output = re.sub(r"/tmp/", "", output)
+        output = PathCleaner._WIN_TEMP_RE.sub("", output)
+        output = PathCleaner._NIX_TEMP_RE.sub("", output)
         
         return output
 
@@ -118,10 +244,47 @@ class FileManager:
         else:
             self.temp_dir = os.path.join(os.path.dirname(__file__), "..", "tmp")
         os.makedirs(self.temp_dir, exist_ok=True)
+        # One reusable temp path per (thread, suffix), removed at interpreter exit
+        self._file_pool: Dict[Tuple[int, str], str] = {}
+        self._file_pool_lock = threading.Lock()
+        atexit.register(self.cleanup_pool)
     
     @contextmanager
     def create_temp_file(self, content: str, suffix: str):
         """Create a temporary file with automatic cleanup"""
+        if suffix == ".java":
+            # javac emits .class files named after the source, so keep Java paths unique
+            with self._create_unique_temp_file(content, suffix) as temp_path:
+                yield temp_path
+            return
+        
+        key = (threading.get_ident(), suffix)
+        with self._file_pool_lock:
+            # Popped while in use, so a nested call on this thread gets its own file
+            temp_path = self._file_pool.pop(key, None)
+        if temp_path is None:
+            fd, temp_path = tempfile.mkstemp(suffix=suffix, dir=self.temp_dir)
+            os.close(fd)
+        
+        try:
+            with open(temp_path, "w", encoding="utf-8") as temp_file:
+                temp_file.write(content)
+            yield temp_path
+        finally:
+            try:
+                # Don't leave user code on disk between requests
+                os.truncate(temp_path, 0)
+            except OSError:
+                self._safe_unlink(temp_path)
+            else:
+                with self._file_pool_lock:
+                    pooled_path = self._file_pool.setdefault(key, temp_path)
+                if pooled_path != temp_path:
+                    self._safe_unlink(temp_path)
+    
+    @contextmanager
+    def _create_unique_temp_file(self, content: str, suffix: str):
+        """Create a single-use temporary file that is removed on exit"""
         temp_file = None
         try:
             temp_file = tempfile.NamedTemporaryFile(
@@ -140,6 +303,14 @@ class FileManager:
             if temp_file:
                 self._safe_unlink(temp_path if 'temp_path' in locals() else temp_file.name)
     
+    def cleanup_pool(self):
+        """Remove all pooled temp files"""
+        with self._file_pool_lock:
+            paths = list(self._file_pool.values())
+            self._file_pool.clear()
+        for path in paths:
+            self._safe_unlink(path)
+    
     def _safe_unlink(self, path: str):
         """Safely remove a file"""
         try:
@@ -159,36 +330,48 @@ class FileManager:
             pass
 
 
+KNOWN_TOOLS = ("flake8", "pylint", "tsc", "eslint", "javac", "gcc", "g++", "npx")
+
+
+@functools.lru_cache(maxsize=None)
+def _which(tool: str) -> Optional[str]:
+    """Process-wide cached shutil.which lookup"""
+    return shutil.which(tool)
+
+
+@functools.lru_cache(maxsize=None)
+def _resolve_node_command(tool: str) -> str:
+    """Resolve npx or the tool itself, cached for the process lifetime"""
+    is_windows = platform.system() == "Windows"
+    # Check for npx first
+    npx_cmd = "npx.cmd" if is_windows else "npx"
+    if _which(npx_cmd):
+        return npx_cmd
+    # Fallback to direct tool execution
+    tool_cmd = f"{tool}.cmd" if is_windows else tool
+    if _which(tool_cmd):
+        return tool_cmd
+    raise ToolExecutionError(f"Neither npx nor {tool} found in PATH")
+
+
 class ToolDetector:
     """Detects available tools and provides cross-platform commands"""
     
-    def __init__(self):
-        self._tool_cache = {}
+    def warm_cache(self, tools: Tuple[str, ...] = KNOWN_TOOLS):
+        """Resolve known tools up front so requests don't pay for PATH scans"""
+        is_windows = platform.system() == "Windows"
+        for tool in tools:
+            _which(tool)
+            if is_windows:
+                _which(f"{tool}.cmd")
     
     def get_node_command(self, tool: str) -> str:
         """Get the appropriate Node.js command for the platform"""
-        cache_key = f"node_{tool}"
-        if cache_key in self._tool_cache:
-            return self._tool_cache[cache_key]
-        
-        # Check for npx first
-        npx_cmd = "npx.cmd" if platform.system() == "Windows" else "npx"
-        if shutil.which(npx_cmd):
-            cmd = npx_cmd
-        else:
-            # Fallback to direct tool execution
-            tool_cmd = f"{tool}.cmd" if platform.system() == "Windows" else tool
-            if shutil.which(tool_cmd):
-                cmd = tool_cmd
-            else:
-                raise ToolExecutionError(f"Neither npx nor {tool} found in PATH")
-        
-        self._tool_cache[cache_key] = cmd
-        return cmd
+        return _resolve_node_command(tool)
     
     def check_tool_available(self, tool: str) -> bool:
         """Check if a tool is available"""
-        return shutil.which(tool) is not None
+        return _which(tool) is not None
 
 
 class LanguageAnalyzer:
@@ -206,50 +389,69 @@ class LanguageAnalyzer:
     def analyze(self, content: str, filename: str) -> List[AnalysisIssue]:
         """Analyze code content - to be implemented by subclasses"""
         raise NotImplementedError
+    
+    def _tool_output_lines(self, cmd: List[str], temp_path: str, display_name: str) -> Iterator[str]:
+        """Stream a tool's output with temp paths cleaned from each line"""
+        for line in self.command_runner.run_command_lines(cmd):
+            yield self.path_cleaner.clean_temp_paths(line, temp_path, display_name)
+    
+    def _run_tools(self, tools: List[Tuple[List[str], Callable[[Iterable[str]], List[AnalysisIssue]]]],
+                   temp_path: str, display_name: str) -> List[AnalysisIssue]:
+        """Run (command, parser) pairs against a temp file, concurrently when enabled"""
+        def run_tool(cmd: List[str], parser: Callable[[Iterable[str]], List[AnalysisIssue]]) -> List[AnalysisIssue]:
+            try:
+                return parser(self._tool_output_lines(cmd, temp_path, display_name))
+            except ToolExecutionError as e:
+                _record_transient_failure(str(e))
+                return []  # Tool failed, continue with other tools
+        
+        if not self.config.enable_parallel_execution or len(tools) < 2:
+            return [issue for cmd, parser in tools for issue in run_tool(cmd, parser)]
+        
+        # Tools are subprocess-bound, so threads overlap them without GIL contention.
+        # Each worker runs in a copy of this context so its failures are recorded here
+        tool_results = {}
+        with ThreadPoolExecutor(max_workers=min(self.config.max_workers, len(tools))) as executor:
+            futures = {executor.submit(contextvars.copy_context().run, run_tool, cmd, parser): index
+                       for index, (cmd, parser) in enumerate(tools)}
+            for future in as_completed(futures):
+                tool_results[futures[future]] = future.result()
+        
+        # Keep tool order stable regardless of completion order
+        issues = []
+        for index in range(len(tools)):
+            issues.extend(tool_results[index])
+        return issues
 
 
 class PythonAnalyzer(LanguageAnalyzer):
     """Python code analyzer"""
     
     def analyze(self, content: str, filename: str) -> List[AnalysisIssue]:
-        issues = []
         display_name = "your_file.py"
         
         with self.file_manager.create_temp_file(content, ".py") as temp_path:
-            # Run flake8
+            tools = []
             if self.tool_detector.check_tool_available("flake8"):
-                try:
-                    result = self.command_runner.run_command(["flake8", temp_path])
-                    if result.strip():
-                        cleaned = self.path_cleaner.clean_temp_paths(result, temp_path, display_name)
-                        issues.extend(self._parse_flake8_output(cleaned))
-                except ToolExecutionError:
-                    pass  # Tool failed, continue with other tools
-            
-            # Run pylint
+                tools.append((["flake8", temp_path], self._parse_flake8_output))
             if self.tool_detector.check_tool_available("pylint"):
-                try:
-                    result = self.command_runner.run_command(["pylint", temp_path])
-                    if result.strip():
-                        cleaned = self.path_cleaner.clean_temp_paths(result, temp_path, display_name)
-                        issues.extend(self._parse_pylint_output(cleaned))
-                except ToolExecutionError:
-                    pass
-        
-        return issues
+                tools.append((["pylint", temp_path], self._parse_pylint_output))
+            
+            return self._run_tools(tools, temp_path, display_name)
     
-    def _parse_flake8_output(self, output: str) -> List[AnalysisIssue]:
+    def _parse_flake8_output(self, lines: Iterable[str]) -> List[AnalysisIssue]:
         """Parse flake8 output into AnalysisIssue objects"""
         issues = []
-        for line in output.strip().splitlines():
+        for line in lines:
             if line.strip():
                 issues.append(AnalysisIssue(issue=line.strip()))
         return issues
     
-    def _parse_pylint_output(self, output: str) -> List[AnalysisIssue]:
+    def _parse_pylint_output(self, lines: Iterable[str]) -> List[AnalysisIssue]:
         """Parse pylint output into AnalysisIssue objects"""
         issues = []
-        for line in output.strip().splitlines():
+        for line in lines:
+            line = line.strip()
             if line and not line.startswith("Your code has been rated"):
                 issues.append(AnalysisIssue(issue=line.strip()))
         return issues
@@ -259,47 +461,41 @@ class JavaScriptAnalyzer(LanguageAnalyzer):
     """JavaScript/TypeScript code analyzer"""
     
     def analyze(self, content: str, filename: str) -> List[AnalysisIssue]:
-        issues = []
         is_typescript = filename.endswith((".ts", ".tsx"))
         ext = ".ts" if is_typescript else ".js"
         display_name = f"your_file{ext}"
         
         with self.file_manager.create_temp_file(content, ext) as temp_path:
+            tools = []
             # Run TypeScript compiler for .ts files
             if is_typescript:
                 try:
                     tsc_cmd = self.tool_detector.get_node_command("tsc")
-                    result = self.command_runner.run_command([tsc_cmd, "--noEmit", temp_path])
-                    if result.strip():
-                        cleaned = self.path_cleaner.clean_temp_paths(result, temp_path, display_name)
-                        issues.extend(self._parse_tsc_output(cleaned))
-                except (ToolExecutionError, Exception):
+                    tools.append(([tsc_cmd, "--noEmit", temp_path], self._parse_tsc_output))
+                except ToolExecutionError:
                     pass
             
             # Run ESLint
             try:
                 eslint_cmd = self.tool_detector.get_node_command("eslint")
-                result = self.command_runner.run_command([eslint_cmd, "--no-ignore", temp_path])
-                if result.strip():
-                    cleaned = self.path_cleaner.clean_temp_paths(result, temp_path, display_name)
-                    issues.extend(self._parse_eslint_output(cleaned))
-            except (ToolExecutionError, Exception):
+                tools.append(([eslint_cmd, "--no-ignore", temp_path], self._parse_eslint_output))
+            except ToolExecutionError:
                 pass
-        
-        return issues
+            
+            return self._run_tools(tools, temp_path, display_name)
     
-    def _parse_tsc_output(self, output: str) -> List[AnalysisIssue]:
+    def _parse_tsc_output(self, lines: Iterable[str]) -> List[AnalysisIssue]:
         """Parse TypeScript compiler output"""
         issues = []
-        for line in output.strip().splitlines():
+        for line in lines:
             if line.strip():
                 issues.append(AnalysisIssue(issue=line.strip()))
         return issues
     
-    def _parse_eslint_output(self, output: str) -> List[AnalysisIssue]:
+    def _parse_eslint_output(self, lines: Iterable[str]) -> List[AnalysisIssue]:
         """Parse ESLint output"""
         issues = []
-        for line in output.strip().splitlines():
+        for line in lines:
             if line.strip():
                 issues.append(AnalysisIssue(issue=line.strip()))
         return issues
@@ -314,11 +510,10 @@ class JavaAnalyzer(LanguageAnalyzer):
         
         with self.file_manager.create_temp_file(content, ".java") as temp_path:
             try:
-                result = self.command_runner.run_command(["javac", temp_path])
-                if result.strip():
-                    cleaned = self.path_cleaner.clean_temp_paths(result, temp_path, display_name)
-                    issues.extend(self._parse_javac_output(cleaned))
-            except ToolExecutionError:
+                lines = self._tool_output_lines(["javac", temp_path], temp_path, display_name)
+                issues.extend(self._parse_javac_output(lines))
+            except ToolExecutionError as e:
+                _record_transient_failure(str(e))
                 issues.append(AnalysisIssue(
                     issue="Java file could not be analyzed: compiler not available or failed",
                     explanation="Ensure javac is installed and accessible"
@@ -329,10 +524,10 @@ class JavaAnalyzer(LanguageAnalyzer):
         
         return issues
     
-    def _parse_javac_output(self, output: str) -> List[AnalysisIssue]:
+    def _parse_javac_output(self, lines: Iterable[str]) -> List[AnalysisIssue]:
         """Parse javac compiler output"""
         issues = []
-        for line in output.strip().splitlines():
+        for line in lines:
             if line.strip():
                 issues.append(AnalysisIssue(issue=line.strip()))
         return issues
@@ -341,36 +536,33 @@ class JavaAnalyzer(LanguageAnalyzer):
 class CAnalyzer(LanguageAnalyzer):
     """C/C++ code analyzer"""
     
-    def __init__(self, *args, **kwargs):
-        super().__init__(*args, **kwargs)
-        self.is_cpp = False
-    
     def analyze(self, content: str, filename: str) -> List[AnalysisIssue]:
-        self.is_cpp = filename.endswith((".cpp", ".cc", ".cxx", ".hpp", ".hxx"))
-        ext = ".cpp" if self.is_cpp else ".c"
+        # Kept local: one instance serves concurrent requests for every C/C++ extension
+        is_cpp = filename.endswith((".cpp", ".cc", ".cxx", ".hpp", ".hxx"))
+        ext = ".cpp" if is_cpp else ".c"
         display_name = f"your_file{ext}"
-        compiler = "g++" if self.is_cpp else "gcc"
+        compiler = "g++" if is_cpp else "gcc"
         
         issues = []
         
         with self.file_manager.create_temp_file(content, ext) as temp_path:
             try:
-                result = self.command_runner.run_command([compiler, "-fsyntax-only", temp_path])
-                if result.strip():
-                    cleaned = self.path_cleaner.clean_temp_paths(result, temp_path, display_name)
-                    issues.extend(self._parse_compiler_output(cleaned, content))
+                # Drain the compiler before the per-line AI calls so they don't count against its timeout
+                lines = list(self._tool_output_lines([compiler, "-fsyntax-only", temp_path], temp_path, display_name))
+                issues.extend(self._parse_compiler_output(lines, content, is_cpp))
             except ToolExecutionError as e:
+                _record_transient_failure(str(e))
                 issues.append(AnalysisIssue(
-                    issue=f"{'C++' if self.is_cpp else 'C'} file could not be analyzed: {e}",
+                    issue=f"{'C++' if is_cpp else 'C'} file could not be analyzed: {e}",
                     explanation="Compiler not available or compilation failed"
                 ))
         
         return issues
     
-    def _parse_compiler_output(self, output: str, content: str) -> List[AnalysisIssue]:
+    def _parse_compiler_output(self, lines: Iterable[str], content: str, is_cpp: bool = False) -> List[AnalysisIssue]:
         """Parse GCC/G++ compiler output"""
         issues = []
-        lines = [line for line in output.splitlines() if line.strip()]
+        ai_explanations: Dict[str, str] = {}  # Identical prompts only round-trip once per file
         
         for line in lines:
             if "error:" in line or "warning:" in line:
@@ -379,16 +571,21 @@ class CAnalyzer(LanguageAnalyzer):
                 
                 if not explanation:
                     # Generate AI explanation
-                    lang = "C++" if self.is_cpp else "C"
+                    lang = "C++" if is_cpp else "C"
                     prompt = (
                         f"As a {lang} code review assistant, explain this compiler error or warning and how to fix it:\n"
                         f"Issue: {line}\n"
                         f"Code:\n{content[:self.config.max_code_snippet_length]}"
                     )
-                    try:
-                        explanation = model_instance.explain(prompt)
-                    except Exception:
-                        explanation = "No explanation available"
+                    if prompt not in ai_explanations:
+                        try:
+                            ai_explanations[prompt] = model_instance.explain(prompt)
+                        except Exception as e:
+                            _record_transient_failure(str(e))
+                            ai_explanations[prompt] = "No explanation available"
+                        if ai_explanations[prompt].startswith(API_ERROR_PREFIX):
+                            _record_transient_failure(ai_explanations[prompt])
+                    explanation = ai_explanations[prompt]
                 
                 issues.append(AnalysisIssue(
                     issue=line.strip(),
@@ -399,10 +596,7 @@ class CAnalyzer(LanguageAnalyzer):
     
     def _get_mapped_explanation(self, error_message: str) -> Optional[str]:
         """Get predefined explanation for common errors"""
-        for key, explanation in COMMON_ERROR_EXPLANATIONS.items():
-            if key in error_message:
-                return explanation
-        return None
+        return lookup_error_explanation(error_message)
 
 
 class StructuredDataAnalyzer(LanguageAnalyzer):
@@ -413,7 +607,7 @@ class StructuredDataAnalyzer(LanguageAnalyzer):
         
         if filename.endswith(".json"):
             try:
-                json.loads(content)
+                self._validate_json(content)
             except json.JSONDecodeError as e:
                 issues.append(AnalysisIssue(
                     issue=f"JSON SyntaxError: {e}",
@@ -422,7 +616,7 @@ class StructuredDataAnalyzer(LanguageAnalyzer):
         
         elif filename.endswith((".yaml", ".yml")):
             try:
-                yaml.safe_load(content)
+                yaml.load(content, Loader=_YAML_LOADER)
             except yaml.YAMLError as e:
                 issues.append(AnalysisIssue(
                     issue=f"YAML SyntaxError: {e}",
@@ -430,32 +624,89 @@ class StructuredDataAnalyzer(LanguageAnalyzer):
                 ))
         
         return issues
+    
+    @staticmethod
+    def _validate_json(content: str):
+        """Parse JSON for validation only, raising json.JSONDecodeError on failure"""
+        if orjson is not None:
+            try:
+                orjson.loads(content)
+                return
+            except orjson.JSONDecodeError:
+                pass  # Confirm with stdlib, which also accepts NaN and big integers
+        json.loads(content)
+
+
+# Compiled once; these run for every issue and every summary
+_LINT_CODE_RE = re.compile(r"\b([A-Z]\d{3,})\b")
+_ESLINT_RULE_RE = re.compile(r"\bno-[\w-]+\b")
+_FENCE_OPEN_RE = re.compile(r"^```[\w]*\n")
+_FENCE_CLOSE_RE = re.compile(r"\n```$")
+_BOLD_RE = re.compile(r"\*\*(.*?)\*\*")
+_MULTI_NEWLINE_RE = re.compile(r"\n{2,}")
+_NUMBERED_START_RE = re.compile(r"^1\.\s")
+
+SUMMARY_KEYWORDS = [
+    'problems (', 'potentially fixable', 'Summary of', 'Code Explanation',
+    'n - node', 'plain English', 'A simple summary', 'This is a very simple',
+    'error and 0 warnings', 'how to fix the problem with the assistant',
+    'Summarize', 'example of', 'assistant', 'fix the problem',
+]
+_SUMMARY_RE = re.compile("|".join(re.escape(keyword) for keyword in SUMMARY_KEYWORDS), re.IGNORECASE)
 
 
 def is_real_lint_issue(issue: str) -> bool:
-    summary_keywords = [
-        'problems (', 'potentially fixable', 'Summary of', 'Code Explanation',
-        'n - node', 'plain English', 'A simple summary', 'This is a very simple',
-        'error and 0 warnings', 'how to fix the problem with the assistant',
-        'Summarize', 'example of', 'assistant', 'fix the problem',
-    ]
     if issue.strip().lower() == "code explanation":
         return False
-    if any(keyword.lower() in issue.lower() for keyword in summary_keywords):
-        return False
-    return True
+    return _SUMMARY_RE.search(issue) is None
 
 def extract_lint_code(issue: str) -> Optional[str]:
     # Try to extract the error code (works for Python, JS, etc)
-    match = re.search(r"\b([A-Z]\d{3,})\b", issue)
+    match = _LINT_CODE_RE.search(issue)
     if match:
         return match.group(1)
-    match = re.search(r"\bno-[\w-]+\b", issue)
+    match = _ESLINT_RULE_RE.search(issue)
     if match:
         return match.group(0)
     return None
 
 
+# file:line:col: (flake8, pylint, gcc, javac), file(line,col) (tsc), leading "line:col" (eslint)
+_ISSUE_LOCATION_RE = re.compile(r":\d+(?::\d+)?:|\(\d+,\d+\)|^\s*\d+:\d+(?=\s)")
+
+
+def normalize_issue_text(issue: str) -> str:
+    """Strip line/column positions so repeated issues compare equal"""
+    return _ISSUE_LOCATION_RE.sub(":", issue).strip()
+
+
+SUGGESTION_PROMPT_TEMPLATE = (
+    "Given this code issue:\n"
+    "Issue: {issue}\n"
+    "Relevant code:\n{code_snippet}\n"
+    "Suggest a corrected version of the code, if possible. "
+    "Only output code, no explanation."
+)
+
+SUMMARY_PROMPT_TEMPLATE = (
+    "You are a senior software engineer performing code analysis on a {lang} file.\n"
+    "Explain the code *strictly* in the following professional format:\n\n"
+    "1. Provide a numbered list of what the code does — one sentence per point.\n"
+    "2. Do not include any markdown, extra newlines, or conversational language.\n"
+    "3. End with a 'Notes:' section only if suggestions or improvements are needed.\n\n"
+    "Follow this sample structure strictly:\n"
+    "1. Imports standard modules os and sys.\n"
+    "2. Defines a User class with name, age, and data attributes.\n"
+    "3. Implements method add_data to append to data list.\n"
+    "4. Implements method get_data to return data.\n"
+    "5. Implements method to calculate year of birth.\n"
+    "6. Defines a function to process a list of users.\n"
+    "7. Creates two User objects and processes them.\n"
+    "Notes: Remove unused imports. Add input validation for age.\n\n"
+    "Code:\n{content}"
+)
+
+
 class CodeAnalyzer:
     """Main code analyzer that coordinates language-specific analyzers"""
     
@@ -465,31 +716,51 @@ class CodeAnalyzer:
         self.command_runner = CommandRunner(self.config.timeout)
         self.path_cleaner = PathCleaner()
         self.tool_detector = ToolDetector()
+        self.tool_detector.warm_cache()
         
         # Initialize language analyzers
         analyzer_args = (self.config, self.file_manager, self.command_runner, 
                         self.path_cleaner, self.tool_detector)
         
+        # Analyzers are stateless, so extensions of one language share an instance
+        python_analyzer = PythonAnalyzer(*analyzer_args)
+        js_analyzer = JavaScriptAnalyzer(*analyzer_args)
+        java_analyzer = JavaAnalyzer(*analyzer_args)
+        c_analyzer = CAnalyzer(*analyzer_args)
+        data_analyzer = StructuredDataAnalyzer(*analyzer_args)
+        
         self.analyzers = {
-            '.py': PythonAnalyzer(*analyzer_args),
-            '.js': JavaScriptAnalyzer(*analyzer_args),
-            '.jsx': JavaScriptAnalyzer(*analyzer_args),
-            '.ts': JavaScriptAnalyzer(*analyzer_args),
-            '.tsx': JavaScriptAnalyzer(*analyzer_args),
-            '.java': JavaAnalyzer(*analyzer_args),
-            '.c': CAnalyzer(*analyzer_args),
-            '.cpp': CAnalyzer(*analyzer_args),
-            '.cc': CAnalyzer(*analyzer_args),
-            '.cxx': CAnalyzer(*analyzer_args),
-            '.hpp': CAnalyzer(*analyzer_args),
-            '.hxx': CAnalyzer(*analyzer_args),
-            '.json': StructuredDataAnalyzer(*analyzer_args),
-            '.yaml': StructuredDataAnalyzer(*analyzer_args),
-            '.yml': StructuredDataAnalyzer(*analyzer_args),
+            '.py': python_analyzer,
+            '.js': js_analyzer,
+            '.jsx': js_analyzer,
+            '.ts': js_analyzer,
+            '.tsx': js_analyzer,
+            '.java': java_analyzer,
+            '.c': c_analyzer,
+            '.cpp': c_analyzer,
+            '.cc': c_analyzer,
+            '.cxx': c_analyzer,
+            '.hpp': c_analyzer,
+            '.hxx': c_analyzer,
+            '.json': data_analyzer,
+            '.yaml': data_analyzer,
+            '.yml': data_analyzer,
         }
+        
+        # LRU of (results, summary) keyed on content hash + extension
+        self._result_cache: "OrderedDict[bytes, Tuple[List[Dict], str]]" = OrderedDict()
+        self._result_cache_lock = threading.Lock()
     
     def analyze_and_explain(self, content: bytes, filename: str) -> Tuple[List[Dict], str]:
         """Main analysis function - maintains compatibility with original API"""
+        results, code_summary, _ = self.analyze_and_explain_cacheable(content, filename)
+        return results, code_summary
+    
+    def analyze_and_explain_cacheable(self, content: bytes, filename: str) -> Tuple[List[Dict], str, bool]:
+        """analyze_and_explain(), also reporting whether the result is safe for callers to cache.
+        
+        It is not when a tool or model call failed, since a retry may succeed.
+        """
         try:
             # Input validation
             if not content:
@@ -498,15 +769,6 @@ class CodeAnalyzer:
             if not filename:
                 raise AnalysisError("Filename is required")
             
-            # Decode content safely
-            try:
-                content_str = content.decode('utf-8')
-            except UnicodeDecodeError:
-                try:
-                    content_str = content.decode('latin-1')
-                except UnicodeDecodeError:
-                    raise AnalysisError("Cannot decode file content")
-            
             # Get file extension
             _, ext = os.path.splitext(filename.lower())
             
@@ -514,15 +776,33 @@ class CodeAnalyzer:
             if ext not in self.analyzers:
                 raise UnsupportedFileTypeError(f"Analysis for {ext} files is not implemented yet")
             
+            # Identical bytes with the same extension produce identical results
+            cache_key = hashlib.blake2b(content, digest_size=16).digest() + ext.encode()
+            cached = self._get_cached_result(cache_key)
+            if cached is not None:
+                return (*cached, True)
+            
+            # Decode content safely; undecodable bytes become U+FFFD in a single pass
+            content_str = content.decode('utf-8', errors='replace')
+            
             # Run analysis
             analyzer = self.analyzers[ext]
-            issues = analyzer.analyze(content_str, filename)
+            failures: List[str] = []
+            failures_token = _transient_failures.set(failures)
+            try:
+                issues = analyzer.analyze(content_str, filename)
+            finally:
+                _transient_failures.reset(failures_token)
             
             # Generate code summary
             code_summary = self._generate_code_summary(content_str, filename)
 
             # Incorporate AI-powered suggestions (PHASE 4A)
             results = []
+            # Issues differing only by location share one suggestion request
+            suggestion_groups: Dict[str, List[Dict]] = {}
+            # Use a relevant code snippet for suggestions
+            code_snippet = content_str[:self.config.max_code_snippet_length]
             for issue in issues:
                 # Convert to dict if needed
                 if isinstance(issue, AnalysisIssue):
@@ -536,35 +816,73 @@ class CodeAnalyzer:
                     issue_dict = {"issue": str(issue)}
 
                 # Add AI suggestion if actionable
-                suggestion = None
+                issue_dict["suggestion"] = None
                 if "issue" in issue_dict and issue_dict["issue"] and is_real_lint_issue(issue_dict["issue"]):
-                    # Use a relevant code snippet for suggestion
-                    code_snippet = content_str[:self.config.max_code_snippet_length]
-                    suggestion_prompt = (
-                        f"Given this code issue:\n"
-                        f"Issue: {issue_dict['issue']}\n"
-                        f"Relevant code:\n{code_snippet}\n"
-                        "Suggest a corrected version of the code, if possible. "
-                        "Only output code, no explanation."
-                    )
-                    try:
-                        suggestion = model_instance.explain(suggestion_prompt)
-                        if suggestion:
-                            suggestion = re.sub(r"^```[\w]*\n", "", suggestion)
-                            suggestion = re.sub(r"\n```$", "", suggestion)
-                            suggestion = suggestion.strip()
-                    except Exception:
-                        suggestion = None
-                issue_dict["suggestion"] = suggestion
+                    # Known lint codes already have canned guidance, no model call needed
+                    lint_code = extract_lint_code(issue_dict["issue"])
+                    if lint_code in LINT_EXPLANATIONS:
+                        issue_dict["suggestion"] = LINT_EXPLANATIONS[lint_code]
+                    else:
+                        group_key = normalize_issue_text(issue_dict["issue"])
+                        suggestion_groups.setdefault(group_key, []).append(issue_dict)
                 results.append(issue_dict)
+
+            # One batched model request covers every actionable issue group in the file
+            if suggestion_groups:
+                groups = list(suggestion_groups.values())
+                # The first issue of each group stands in for the rest
+                suggestion_prompts = [
+                    SUGGESTION_PROMPT_TEMPLATE.format_map(
+                        {"issue": group[0]["issue"], "code_snippet": code_snippet}
+                    )
+                    for group in groups
+                ]
+                try:
+                    suggestions = model_instance.explain_batch(suggestion_prompts)
+                except Exception as e:
+                    failures.append(str(e))
+                    suggestions = [None] * len(suggestion_prompts)
+                for group, suggestion in zip(groups, suggestions):
+                    if not suggestion or suggestion.startswith(API_ERROR_PREFIX):
+                        failures.append(f"No suggestion for: {group[0]['issue']}")
+                    if suggestion:
+                        suggestion = _FENCE_OPEN_RE.sub("", suggestion)
+                        suggestion = _FENCE_CLOSE_RE.sub("", suggestion)
+                        suggestion = suggestion.strip()
+                    for issue_dict in group:
+                        issue_dict["suggestion"] = suggestion
             # End AI-powered suggestions block
 
-            return results, code_summary
+            # A failed tool or model call may succeed next time, so only clean results are kept
+            cacheable = not failures and code_summary != NO_SUMMARY_MESSAGE
+            if cacheable:
+                self._store_cached_result(cache_key, (results, code_summary))
+            return results, code_summary, cacheable
             
         except (AnalysisError, UnsupportedFileTypeError) as e:
-            return [str(e)], "No meaningful summary could be generated for this file."
+            return [str(e)], NO_SUMMARY_MESSAGE, False
         except Exception as e:
-            return [f"Unexpected error during analysis: {e}"], "No meaningful summary could be generated for this file."
+            return [f"Unexpected error during analysis: {e}"], NO_SUMMARY_MESSAGE, False
+    
+    def _get_cached_result(self, key: bytes) -> Optional[Tuple[List[Dict], str]]:
+        """Return a copy of a cached analysis result, if present"""
+        with self._result_cache_lock:
+            cached = self._result_cache.get(key)
+            if cached is None:
+                return None
+            self._result_cache.move_to_end(key)
+        results, code_summary = cached
+        # Hand out copies so callers can't mutate the cached entry
+        return [dict(r) if isinstance(r, dict) else r for r in results], code_summary
+    
+    def _store_cached_result(self, key: bytes, value: Tuple[List[Dict], str]):
+        """Store an analysis result, evicting the least recently used entry"""
+        results, code_summary = value
+        with self._result_cache_lock:
+            self._result_cache[key] = ([dict(r) if isinstance(r, dict) else r for r in results], code_summary)
+            self._result_cache.move_to_end(key)
+            while len(self._result_cache) > self.config.result_cache_size:
+                self._result_cache.popitem(last=False)
     
     def _generate_code_summary(self, content: str, filename: str) -> str:
         """Generate AI-powered code summary"""
@@ -581,52 +899,54 @@ class CodeAnalyzer:
             else:
                 lang = "this"
             
-            prompt = (
-                f"You are a senior software engineer performing code analysis on a {lang} file.\n"
-                "Explain the code *strictly* in the following professional format:\n\n"
-                "1. Provide a numbered list of what the code does — one sentence per point.\n"
-                "2. Do not include any markdown, extra newlines, or conversational language.\n"
-                "3. End with a 'Notes:' section only if suggestions or improvements are needed.\n\n"
-                "Follow this sample structure strictly:\n"
-                "1. Imports standard modules os and sys.\n"
-                "2. Defines a User class with name, age, and data attributes.\n"
-                "3. Implements method add_data to append to data list.\n"
-                "4. Implements method get_data to return data.\n"
-                "5. Implements method to calculate year of birth.\n"
-                "6. Defines a function to process a list of users.\n"
-                "7. Creates two User objects and processes them.\n"
-                "Notes: Remove unused imports. Add input validation for age.\n\n"
-                f"Code:\n{content}"
+            # Cap the embedded code so huge files don't blow up latency and token cost
+            prompt = SUMMARY_PROMPT_TEMPLATE.format_map(
+                {"lang": lang, "content": content[:self.config.max_summary_length]}
             )
             
             summary = model_instance.explain(prompt)
             
             if summary and summary.strip():
                 # Clean up formatting
-                summary = re.sub(r"\*\*(.*?)\*\*", r"\1", summary)
-                summary = re.sub(r"\n{2,}", "\n", summary.strip())
+                summary = _BOLD_RE.sub(r"\1", summary)
+                summary = _MULTI_NEWLINE_RE.sub("\n", summary.strip())
                 summary = summary.strip()
                 
                 # Validate format
-                if re.match(r"^1\.\s", summary):
+                if _NUMBERED_START_RE.match(summary):
                     return summary
             
-            return "No meaningful summary could be generated for this file."
+            return NO_SUMMARY_MESSAGE
             
         except Exception:
-            return "No meaningful summary could be generated for this file."
+            return NO_SUMMARY_MESSAGE
 
 
 # Maintain backward compatibility
 def get_mapped_explanation(error_message):
     """Legacy function for backward compatibility"""
-    for key, explanation in COMMON_ERROR_EXPLANATIONS.items():
-        if key in error_message:
-            return explanation
-    return None
+    return lookup_error_explanation(error_message)
+
+
+_default_analyzer: Optional[CodeAnalyzer] = None
+_default_analyzer_lock = threading.Lock()
+
+
+def get_default_analyzer() -> CodeAnalyzer:
+    """Shared CodeAnalyzer so its result cache persists across requests"""
+    global _default_analyzer
+    if _default_analyzer is None:
+        with _default_analyzer_lock:
+            if _default_analyzer is None:
+                _default_analyzer = CodeAnalyzer()
+    return _default_analyzer
 
 
 def analyze_and_explain(content: bytes, filename: str):
     """Legacy function for backward compatibility"""
-    analyzer = CodeAnalyzer()
-    return analyzer.analyze_and_explain(content, filename)
\ No newline at end of file
+    return get_default_analyzer().analyze_and_explain(content, filename)
+
+
+def analyze_and_explain_cacheable(content: bytes, filename: str):
+    """analyze_and_explain() plus whether the result is safe to cache"""
+    return get_default_analyzer().analyze_and_explain_cacheable(content, filename)
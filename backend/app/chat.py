@@ -68,7 +68,7 @@ class ChatService:
         """Get response from AI model with error handling"""
         try:
             # Add timeout and other safety measures as needed
-            response = model_instance.explain(prompt)
+            response = await model_instance.explain_async(prompt)
             
             if not response or not response.strip():
                 raise ValueError("Empty response from AI model")
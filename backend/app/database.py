@@ -1,15 +1,40 @@
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker, declarative_base
+import os
+from sqlalchemy import text
+from sqlalchemy.orm import declarative_base
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
 
-SQLALCHEMY_DATABASE_URL = "sqlite:///./test.db"  # Change as needed
+try:
+    import redis
+    import redis.asyncio
+except ImportError:  # Optional; responses are simply not cached without it
+    redis = None
 
-engine = create_engine(SQLALCHEMY_DATABASE_URL, connect_args={"check_same_thread": False})
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+# Async driver URL, e.g. "postgresql+asyncpg://..." for PostgreSQL
+ASYNC_SQLALCHEMY_DATABASE_URL = "sqlite+aiosqlite:///./test.db"  # Change as needed
+
+# One process-wide pool; sessions check a connection out per request and return it on close.
+# Endpoints wait on the database from the event loop instead of holding a threadpool worker
+async_engine = create_async_engine(
+    ASYNC_SQLALCHEMY_DATABASE_URL,
+    pool_size=20,
+    max_overflow=10,
+    pool_timeout=30,  # Fail a checkout after 30s instead of waiting indefinitely on a starved pool
+    pool_recycle=3600,
+    pool_pre_ping=True,
+)
+AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
 Base = declarative_base()
 
-def get_db():
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
\ No newline at end of file
+# Read-through cache for serialized responses. Configure the server with
+# maxmemory-policy allkeys-lru so it evicts old entries instead of refusing writes
+REDIS_URL = os.getenv("REDIS_URL")
+redis_client = redis.asyncio.Redis.from_url(REDIS_URL, socket_timeout=1) if redis is not None and REDIS_URL else None
+
+async def warm_pool():
+    """Open a first pooled connection so the first request doesn't pay for connecting"""
+    async with async_engine.connect() as connection:
+        await connection.execute(text("SELECT 1"))
+
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
\ No newline at end of file
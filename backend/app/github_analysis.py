@@ -1,91 +1,445 @@
-from fastapi import APIRouter, HTTPException, Depends
-from pydantic import BaseModel, HttpUrl
+from fastapi import APIRouter, HTTPException, Depends, Request, Response, status
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel, HttpUrl, ConfigDict, TypeAdapter
 from github import Github, GithubException
 import os
-import re
-from typing import Optional, List, Dict, Any
-from urllib.parse import urlparse
+import time
+import random
+import asyncio
+from itertools import islice
+import functools
+import threading
+import httpx
+import orjson
+import logging
+from collections import OrderedDict
+from typing import Optional, List, Dict, Any, Union, Tuple, Callable, AsyncIterator
+from urllib.parse import quote
+from .github_common import parse_github_url, analyze_code_content
 
 router = APIRouter()
 
+logger = logging.getLogger(__name__)
+
 class GithubAnalysisRequest(BaseModel):
+    model_config = ConfigDict(frozen=True)
+    
     url: str
     github_token: Optional[str] = None
 
 class GithubAnalysisResponse(BaseModel):
+    model_config = ConfigDict(frozen=True)
+    
     file_path: str
     content: str
     analysis_results: List[Dict[str, Any]]
     metadata: Dict[str, Any]
 
-def parse_github_url(url: str) -> Dict[str, str]:
-    """Parse GitHub URL to extract owner, repo, path, and type"""
-    patterns = {
-        'file_blob': r'github\.com/([^/]+)/([^/]+)/blob/([^/]+)/(.+)',
-        'file_raw': r'github\.com/([^/]+)/([^/]+)/raw/([^/]+)/(.+)',
-        'pull_request': r'github\.com/([^/]+)/([^/]+)/pull/(\d+)',
-        'repo': r'github\.com/([^/]+)/([^/]+)/?$',
+# Serializes the already validated responses in one pass, skipping FastAPI's revalidation and jsonable_encoder
+_RESPONSE_LIST_ADAPTER = TypeAdapter(List[GithubAnalysisResponse])
+
+REPO_CACHE_TTL = 300  # Seconds a cached Repository object is reused
+
+@functools.lru_cache(maxsize=128)
+def get_github_client(token: str) -> Github:
+    """Return a shared Github client per token"""
+    return Github(token)
+
+@functools.lru_cache(maxsize=128)
+def _get_github_repo(token: str, full_name: str, ttl_bucket: int):
+    return get_github_client(token).get_repo(full_name)
+
+def get_github_repo(token: str, full_name: str):
+    """Fetch a repository, reusing the client and repo object for up to REPO_CACHE_TTL seconds"""
+    # The bucket changes every REPO_CACHE_TTL seconds, so stale entries stop matching
+    return _get_github_repo(token, full_name, int(time.monotonic() // REPO_CACHE_TTL))
+
+GITHUB_API_URL = "https://api.github.com"
+GITHUB_REQUESTS_PER_SECOND = 80  # Process-wide cap on direct API requests
+GITHUB_MAX_RETRIES = 5
+GITHUB_MAX_BACKOFF = 60  # Longest wait (seconds) before giving up on a rate-limited request
+
+class GithubRateLimitError(Exception):
+    """The GitHub quota is spent for longer than a request is allowed to wait"""
+    def __init__(self, retry_after: float):
+        super().__init__(f"GitHub rate limit exceeded; retry in {int(retry_after) + 1}s")
+        self.retry_after = retry_after
+
+def rate_limit_http_exception(e: GithubRateLimitError) -> HTTPException:
+    """429 telling the client when the GitHub quota resets"""
+    return HTTPException(
+        status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+        detail=str(e),
+        headers={"Retry-After": str(int(e.retry_after) + 1)}
+    )
+
+class TokenBucket:
+    """Async token bucket shared by every direct GitHub API request in the process"""
+    def __init__(self, rate: float, capacity: float):
+        self._rate = rate
+        self._capacity = capacity
+        self._tokens = capacity
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+        self._lock = threading.Lock()
+    
+    def pause_until(self, deadline: float):
+        """Hold back all requests until the given time.monotonic() deadline"""
+        self._paused_until = max(self._paused_until, deadline)
+    
+    async def acquire(self):
+        """Wait for a request slot; raises GithubRateLimitError instead of waiting out a long pause"""
+        pause = self._paused_until - time.monotonic()
+        if pause > GITHUB_MAX_BACKOFF:
+            raise GithubRateLimitError(pause)
+        if pause > 0:
+            await asyncio.sleep(pause)
+        # Reserve a token under the lock, then wait for it outside so callers queue concurrently
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self._capacity, self._tokens + (now - self._updated) * self._rate)
+            self._updated = now
+            self._tokens -= 1
+            wait = -self._tokens / self._rate if self._tokens < 0 else 0
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+_github_limiter = TokenBucket(GITHUB_REQUESTS_PER_SECOND, GITHUB_REQUESTS_PER_SECOND)
+
+def _rate_limit_delay(response: httpx.Response, attempt: int) -> Optional[float]:
+    """Seconds to wait before retrying a 403/429 response, or None if it isn't a rate limit"""
+    retry_after = response.headers.get("Retry-After")
+    if retry_after and retry_after.isdigit():
+        return float(retry_after)
+    if response.headers.get("X-RateLimit-Remaining") == "0":
+        reset = response.headers.get("X-RateLimit-Reset", "")
+        if reset.isdigit():
+            return max(int(reset) - time.time(), 0) + 1
+    if response.status_code == 429 or "rate limit" in response.text.lower():
+        # Secondary limits don't always say how long to wait; back off exponentially with jitter
+        return 2 ** attempt + random.random()
+    return None
+
+async def github_get(client: httpx.AsyncClient, url: str, **kwargs) -> httpx.Response:
+    """GET through the shared rate limiter, retrying rate-limited responses with backoff.
+    
+    Raises GithubRateLimitError when the quota resets too far in the future to wait for.
+    """
+    for attempt in range(GITHUB_MAX_RETRIES + 1):
+        await _github_limiter.acquire()
+        response = await client.get(url, **kwargs)
+        if response.headers.get("X-RateLimit-Remaining") == "0":
+            # Quota is spent; hold back the next requests until it resets
+            reset = response.headers.get("X-RateLimit-Reset", "")
+            if reset.isdigit():
+                _github_limiter.pause_until(time.monotonic() + int(reset) - time.time())
+        if response.status_code not in (403, 429) or attempt == GITHUB_MAX_RETRIES:
+            return response
+        delay = _rate_limit_delay(response, attempt)
+        if delay is None or delay > GITHUB_MAX_BACKOFF:
+            return response
+        await asyncio.sleep(delay)
+
+async def fetch_file_contents(token: str, repo_name: str, paths: List[str],
+                              ref: Optional[str] = None) -> List[Union[bytes, BaseException]]:
+    """Fetch several files concurrently over one HTTP/2 connection, in input order.
+    
+    Failed fetches are returned as the exception instead of raising.
+    """
+    headers = {
+        "Authorization": f"Bearer {token}",
+        # The raw media type returns the file bytes themselves, not base64 wrapped in JSON
+        "Accept": "application/vnd.github.raw",
     }
+    params = {"ref": ref} if ref else None
     
-    for url_type, pattern in patterns.items():
-        match = re.search(pattern, url)
-        if match:
-            if url_type in ['file_blob', 'file_raw']:
-                return {
-                    'type': 'file',
-                    'owner': match.group(1),
-                    'repo': match.group(2),
-                    'branch': match.group(3),
-                    'path': match.group(4)
-                }
-            elif url_type == 'pull_request':
-                return {
-                    'type': 'pull_request',
-                    'owner': match.group(1),
-                    'repo': match.group(2),
-                    'pr_number': int(match.group(3))
-                }
-            elif url_type == 'repo':
-                return {
-                    'type': 'repo',
-                    'owner': match.group(1),
-                    'repo': match.group(2)
-                }
-    
-    raise ValueError("Invalid GitHub URL format")
-
-def analyze_code_content(content: str, filename: str) -> List[Dict[str, Any]]:
-    """Placeholder for your existing code analysis logic"""
-    # Replace this with your actual analysis function
-    issues = []
-    
-    # Example analysis (replace with your actual logic)
-    lines = content.split('\n')
-    for i, line in enumerate(lines, 1):
-        if len(line) > 120:
-            issues.append({
-                "issue": f"E501: Line {i} too long ({len(line)} characters)",
-                "explanation": "Line exceeds maximum length of 120 characters",
-                "suggestion": "Break the line into multiple lines or use line continuation",
-                "severity": "warning",
-                "line_number": i,
-                "doc_link": "https://pep8.org/#maximum-line-length"
-            })
+    async with httpx.AsyncClient(base_url=GITHUB_API_URL, headers=headers, http2=True, timeout=30) as client:
+        async def fetch(path: str) -> bytes:
+            response = await github_get(client, f"/repos/{repo_name}/contents/{quote(path)}", params=params)
+            response.raise_for_status()
+            return response.content
         
-        if 'TODO' in line.upper():
-            issues.append({
-                "issue": f"TODO found at line {i}",
-                "explanation": "TODO comment found in code",
-                "suggestion": "Consider creating a proper issue or completing the task",
-                "severity": "info",
-                "line_number": i,
-                "doc_link": ""
-            })
-    
-    return issues
+        return await asyncio.gather(*(fetch(path) for path in paths), return_exceptions=True)
 
-@router.post("/analyze_github/", response_model=List[GithubAnalysisResponse])
-async def analyze_github(request: GithubAnalysisRequest):
+REPO_INFO_CACHE_MAXSIZE = 256  # Repositories whose ETag and metadata are kept
+_repo_info_cache = OrderedDict()  # (token, full_name) -> (etag, info)
+_repo_info_lock = threading.Lock()
+
+async def fetch_repo_info(token: str, full_name: str) -> Dict[str, Any]:
+    """Fetch basic repository metadata, revalidating the cached copy with If-None-Match.
+    
+    GitHub answers an unchanged repository with 304 Not Modified, which does not count
+    against the rate limit. Raises httpx.HTTPStatusError for other error responses and
+    GithubRateLimitError when the quota is spent.
+    """
+    # The token is part of the key since visibility of private repositories depends on it
+    key = (token, full_name)
+    with _repo_info_lock:
+        cached = _repo_info_cache.get(key)
+    headers = {
+        "Authorization": f"Bearer {token}",
+        "Accept": "application/vnd.github+json",
+    }
+    if cached:
+        headers["If-None-Match"] = cached[0]
+    
+    async with httpx.AsyncClient(base_url=GITHUB_API_URL, headers=headers, http2=True, timeout=30) as client:
+        response = await github_get(client, f"/repos/{full_name}")
+    if response.status_code == 304 and cached:
+        return cached[1]
+    response.raise_for_status()
+    
+    data = response.json()
+    info = {
+        "name": data["name"],
+        "full_name": data["full_name"],
+        "description": data["description"],
+        "language": data["language"],
+        "stars": data["stargazers_count"],
+        "forks": data["forks_count"],
+        "open_issues": data["open_issues_count"],
+        "created_at": data["created_at"],
+        "updated_at": data["updated_at"],
+        "default_branch": data["default_branch"]
+    }
+    etag = response.headers.get("ETag")
+    if etag:
+        with _repo_info_lock:
+            _repo_info_cache[key] = (etag, info)
+            _repo_info_cache.move_to_end(key)
+            if len(_repo_info_cache) > REPO_INFO_CACHE_MAXSIZE:
+                _repo_info_cache.popitem(last=False)
+    return info
+
+# Repository metadata changes rarely, so browsers and proxies may reuse it briefly
+REPO_INFO_CACHE_CONTROL = "public, max-age=60"
+
+ANALYSIS_CACHE_MAXSIZE = 1024  # Analyzed blobs kept in memory
+
+AnalyzedFile = Tuple[str, List[Dict[str, Any]]]
+
+class BlobAnalysisCache:
+    """LRU of (content, analysis_results) keyed by git blob SHA and path.
+    
+    A blob SHA is a hash of the file content, so entries never go stale. The path is part
+    of the key because the analyzer picks the language from the file extension.
+    """
+    def __init__(self, maxsize: int = ANALYSIS_CACHE_MAXSIZE):
+        self._entries = OrderedDict()
+        self._maxsize = maxsize
+        self._lock = threading.Lock()
+    
+    def get(self, sha: Optional[str], path: str) -> Optional[AnalyzedFile]:
+        if not sha:
+            return None
+        with self._lock:
+            key = (sha, path)
+            if key not in self._entries:
+                return None
+            self._entries.move_to_end(key)
+            return self._entries[key]
+    
+    def put(self, sha: Optional[str], path: str, content: str, analysis_results: List[Dict[str, Any]],
+            cacheable: bool = True):
+        # A failed analysis may succeed next time, so it must not stick to the blob
+        if not sha or not cacheable:
+            return
+        with self._lock:
+            self._entries[(sha, path)] = (content, analysis_results)
+            self._entries.move_to_end((sha, path))
+            if len(self._entries) > self._maxsize:
+                self._entries.popitem(last=False)
+
+async def iter_analyzed_blobs(token: str, repo_name: str, blobs: List[Tuple[str, Optional[str]]], ref: Optional[str],
+                             analyze: Callable[[str, str], Tuple[List[Dict[str, Any]], bool]],
+                             cache: BlobAnalysisCache) -> AsyncIterator[Optional[AnalyzedFile]]:
+    """Yield (content, analysis_results) for each (path, blob sha), in input order, as each file is analyzed.
+    
+    Blobs already in the cache are neither downloaded nor analyzed again. Files that
+    can't be fetched, decoded or analyzed are yielded as None, except that an exhausted
+    rate limit raises GithubRateLimitError before anything is yielded.
+    """
+    analyzed = [cache.get(sha, path) for path, sha in blobs]
+    missing = [i for i, hit in enumerate(analyzed) if hit is None]
+    raw_contents = {}
+    if missing:
+        fetched = await fetch_file_contents(token, repo_name, [blobs[i][0] for i in missing], ref=ref)
+        raw_contents = dict(zip(missing, fetched))
+        # Every other file would fail the same way, so report it instead of an empty result
+        rate_limited = next((r for r in fetched if isinstance(r, GithubRateLimitError)), None)
+        if rate_limited is not None:
+            raise rate_limited
+    
+    for i, (path, sha) in enumerate(blobs):
+        if analyzed[i] is not None:
+            yield analyzed[i]
+            continue
+        raw_content = raw_contents[i]
+        if isinstance(raw_content, BaseException):
+            yield None
+            continue
+        try:
+            content = raw_content.decode('utf-8')
+            analysis_results, cacheable = await asyncio.to_thread(analyze, content, path)
+        except Exception:
+            yield None
+            continue
+        cache.put(sha, path, content, analysis_results, cacheable)
+        yield content, analysis_results
+
+_analysis_cache = BlobAnalysisCache()
+
+# Extensions picked up from PRs and repository trees; one hash lookup per path
+_ANALYZABLE_EXT = frozenset({'.py', '.js', '.ts', '.jsx', '.tsx', '.java', '.cpp', '.c'})
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+
+async def iter_github_analysis(parsed_url: Dict[str, Any], repo, repo_name: str,
+                               github_token: str) -> AsyncIterator[GithubAnalysisResponse]:
+    """Yield one GithubAnalysisResponse per analyzed file, as soon as that file is done"""
+    if parsed_url['type'] == 'file':
+        # Analyze single file
+        try:
+            file_content = await asyncio.to_thread(
+                repo.get_contents, parsed_url['path'], ref=parsed_url['branch']
+            )
+            if file_content.type == 'file':
+                cached = _analysis_cache.get(file_content.sha, parsed_url['path'])
+                if cached:
+                    content, analysis_results = cached
+                else:
+                    content = file_content.decoded_content.decode('utf-8')
+                    analysis_results, cacheable = await asyncio.to_thread(
+                        analyze_code_content, content, parsed_url['path']
+                    )
+                    _analysis_cache.put(file_content.sha, parsed_url['path'], content, analysis_results, cacheable)
+                
+                yield GithubAnalysisResponse(
+                    file_path=parsed_url['path'],
+                    content=content,
+                    analysis_results=analysis_results,
+                    metadata={
+                        'repo': repo_name,
+                        'branch': parsed_url['branch'],
+                        'sha': file_content.sha,
+                        'file_size': file_content.size,
+                        'last_modified': str(file_content.last_modified) if file_content.last_modified else None
+                    }
+                )
+            else:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail="URL points to a directory, not a file"
+                )
+        except GithubException as e:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"File not found: {e}"
+            )
+    
+    elif parsed_url['type'] == 'pull_request':
+        # Analyze PR files
+        try:
+            pr = await asyncio.to_thread(repo.get_pull, parsed_url['pr_number'])
+            max_files = 30  # One page of get_files() results
+            
+            # get_files() pages through the API lazily, so iterate it off the event loop too.
+            # islice stops paging once enough files are found; removed files fail the cheap status check first
+            pr_files = await asyncio.to_thread(lambda: list(islice((
+                file for file in pr.get_files()
+                if file.status in ('added', 'modified') and os.path.splitext(file.filename)[1] in _ANALYZABLE_EXT
+            ), max_files)))
+            # Fetch uncached file contents concurrently instead of one round-trip per file
+            analyzed_files = iter_analyzed_blobs(
+                github_token, repo_name, [(file.filename, file.sha) for file in pr_files], pr.head.sha,
+                analyze_code_content, _analysis_cache
+            )
+            
+            pr_files_iter = iter(pr_files)
+            async for analyzed_file in analyzed_files:
+                file = next(pr_files_iter)
+                if analyzed_file is None:
+                    continue
+                content, analysis_results = analyzed_file
+                yield GithubAnalysisResponse(
+                    file_path=file.filename,
+                    content=content,
+                    analysis_results=analysis_results,
+                    metadata={
+                        'repo': repo_name,
+                        'pr_number': parsed_url['pr_number'],
+                        'sha': file.sha,
+                        'status': file.status,
+                        'additions': file.additions,
+                        'deletions': file.deletions,
+                        'changes': file.changes
+                    }
+                )
+        
+        except GithubException as e:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"Pull request not found: {e}"
+            )
+    
+    elif parsed_url['type'] == 'repo':
+        # Analyze repository (limited to main files)
+        try:
+            max_files = 10
+            
+            # One recursive tree request lists every path, instead of a get_contents call per directory
+            tree = await asyncio.to_thread(repo.get_git_tree, sha=repo.default_branch, recursive=True)
+            code_entries = [
+                entry for entry in tree.tree
+                if entry.type == "blob" and os.path.splitext(entry.path)[1] in _ANALYZABLE_EXT
+            ][:max_files]
+            analyzed_files = iter_analyzed_blobs(
+                github_token, repo_name, [(entry.path, entry.sha) for entry in code_entries], repo.default_branch,
+                analyze_code_content, _analysis_cache
+            )
+            
+            code_entries_iter = iter(code_entries)
+            async for analyzed_file in analyzed_files:
+                entry = next(code_entries_iter)
+                if analyzed_file is None:
+                    continue
+                content, analysis_results = analyzed_file
+                yield GithubAnalysisResponse(
+                    file_path=entry.path,
+                    content=content,
+                    analysis_results=analysis_results,
+                    metadata={
+                        'repo': repo_name,
+                        'sha': entry.sha,
+                        'file_size': entry.size,
+                        'last_modified': None  # Not part of the tree listing
+                    }
+                )
+        
+        except GithubException as e:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"Repository not found: {e}"
+            )
+
+async def stream_ndjson(first: GithubAnalysisResponse, rest: AsyncIterator[GithubAnalysisResponse],
+                        url: str) -> AsyncIterator[bytes]:
+    """Encode each response as one JSON line while the remaining files are still being analyzed"""
+    yield orjson.dumps(first.model_dump()) + b"\n"
+    try:
+        async for response in rest:
+            yield orjson.dumps(response.model_dump()) + b"\n"
+    except Exception as e:
+        # The status line is already sent, so the stream just ends early
+        logger.error(f"Error streaming analysis for GitHub URL {url}: {str(e)}")
+        return
+    logger.info(f"Successfully analyzed GitHub URL: {url}")
+
+async def run_github_analysis(request: GithubAnalysisRequest, accept: str) -> Response:
+    """Analyze the file, pull request or repository a GitHub URL points to.
+    
+    Streams NDJSON when `accept` asks for it, otherwise returns one JSON list.
+    """
     try:
         # Parse the GitHub URL
         parsed_url = parse_github_url(request.url)
@@ -94,154 +448,73 @@ async def analyze_github(request: GithubAnalysisRequest):
         github_token = request.github_token or os.getenv("GITHUB_TOKEN")
         if not github_token:
             raise HTTPException(
-                status_code=400, 
+                status_code=status.HTTP_400_BAD_REQUEST,
                 detail="GitHub token is required. Set GITHUB_TOKEN environment variable or provide in request."
             )
         
-        g = Github(github_token)
         repo_name = f"{parsed_url['owner']}/{parsed_url['repo']}"
-        repo = g.get_repo(repo_name)
+        repo = await asyncio.to_thread(get_github_repo, github_token, repo_name)
         
-        results = []
+        responses = iter_github_analysis(parsed_url, repo, repo_name, github_token)
         
-        if parsed_url['type'] == 'file':
-            # Analyze single file
-            try:
-                file_content = repo.get_contents(parsed_url['path'], ref=parsed_url['branch'])
-                if file_content.type == 'file':
-                    content = file_content.decoded_content.decode('utf-8')
-                    analysis_results = analyze_code_content(content, parsed_url['path'])
-                    
-                    results.append(GithubAnalysisResponse(
-                        file_path=parsed_url['path'],
-                        content=content,
-                        analysis_results=analysis_results,
-                        metadata={
-                            'repo': repo_name,
-                            'branch': parsed_url['branch'],
-                            'file_size': file_content.size,
-                            'last_modified': file_content.last_modified
-                        }
-                    ))
-                else:
-                    raise HTTPException(status_code=400, detail="URL points to a directory, not a file")
-            except GithubException as e:
-                raise HTTPException(status_code=404, detail=f"File not found: {e}")
-        
-        elif parsed_url['type'] == 'pull_request':
-            # Analyze PR files
-            try:
-                pr = repo.get_pull(parsed_url['pr_number'])
-                files = pr.get_files()
-                
-                for file in files:
-                    if file.status in ['added', 'modified'] and file.filename.endswith(('.py', '.js', '.ts', '.jsx', '.tsx')):
-                        # Get file content
-                        try:
-                            file_content = repo.get_contents(file.filename, ref=pr.head.sha)
-                            content = file_content.decoded_content.decode('utf-8')
-                            analysis_results = analyze_code_content(content, file.filename)
-                            
-                            results.append(GithubAnalysisResponse(
-                                file_path=file.filename,
-                                content=content,
-                                analysis_results=analysis_results,
-                                metadata={
-                                    'repo': repo_name,
-                                    'pr_number': parsed_url['pr_number'],
-                                    'status': file.status,
-                                    'additions': file.additions,
-                                    'deletions': file.deletions,
-                                    'changes': file.changes
-                                }
-                            ))
-                        except Exception as e:
-                            # Skip files that can't be read
-                            continue
-                            
-            except GithubException as e:
-                raise HTTPException(status_code=404, detail=f"Pull request not found: {e}")
+        if NDJSON_MEDIA_TYPE in accept:
+            # Wait for the first file here so lookup errors still get a proper status code
+            first = await anext(responses, None)
+            if first is None:
+                raise HTTPException(
+                    status_code=status.HTTP_404_NOT_FOUND,
+                    detail="No analyzable files found"
+                )
+            return StreamingResponse(stream_ndjson(first, responses, request.url), media_type=NDJSON_MEDIA_TYPE)
         
-        elif parsed_url['type'] == 'repo':
-            # Analyze repository (limited to main Python/JS files)
-            try:
-                contents = repo.get_contents("")
-                supported_extensions = ['.py', '.js', '.ts', '.jsx', '.tsx']
-                
-                def get_code_files(contents_list, max_files=10):
-                    files_processed = 0
-                    for content_file in contents_list:
-                        if files_processed >= max_files:
-                            break
-                            
-                        if content_file.type == "file":
-                            if any(content_file.name.endswith(ext) for ext in supported_extensions):
-                                try:
-                                    file_content = repo.get_contents(content_file.path)
-                                    content = file_content.decoded_content.decode('utf-8')
-                                    analysis_results = analyze_code_content(content, content_file.path)
-                                    
-                                    results.append(GithubAnalysisResponse(
-                                        file_path=content_file.path,
-                                        content=content,
-                                        analysis_results=analysis_results,
-                                        metadata={
-                                            'repo': repo_name,
-                                            'file_size': file_content.size,
-                                            'last_modified': file_content.last_modified
-                                        }
-                                    ))
-                                    files_processed += 1
-                                except:
-                                    continue
-                        elif content_file.type == "dir" and files_processed < max_files:
-                            # Recursively process directories (limited depth)
-                            try:
-                                sub_contents = repo.get_contents(content_file.path)
-                                get_code_files(sub_contents, max_files - files_processed)
-                            except:
-                                continue
-                
-                get_code_files(contents)
-                
-            except GithubException as e:
-                raise HTTPException(status_code=404, detail=f"Repository not found: {e}")
+        results = [response async for response in responses]
         
         if not results:
-            raise HTTPException(status_code=404, detail="No analyzable files found")
-        
-        return results
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="No analyzable files found"
+            )
         
+        logger.info(f"Successfully analyzed GitHub URL: {request.url}")
+        return Response(content=_RESPONSE_LIST_ADAPTER.dump_json(results), media_type="application/json")
+
     except ValueError as e:
-        raise HTTPException(status_code=400, detail=str(e))
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    except HTTPException:
+        raise
+    except GithubRateLimitError as e:
+        raise rate_limit_http_exception(e)
     except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Analysis failed: {str(e)}")
+        logger.error(f"Error analyzing GitHub URL {request.url}: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Analysis failed: {str(e)}"
+        )
+
+@router.post("/analyze_github/", response_model=List[GithubAnalysisResponse])
+async def analyze_github(request: GithubAnalysisRequest, http_request: Request):
+    return await run_github_analysis(request, http_request.headers.get("accept", ""))
 
 # Additional endpoint to get repository information
 @router.get("/github_info/{owner}/{repo}")
-async def get_github_repo_info(owner: str, repo: str):
+async def get_github_repo_info(owner: str, repo: str, response: Response):
     """Get basic repository information"""
     try:
         github_token = os.getenv("GITHUB_TOKEN")
         if not github_token:
             raise HTTPException(status_code=400, detail="GitHub token not configured")
         
-        g = Github(github_token)
-        repo_obj = g.get_repo(f"{owner}/{repo}")
-        
-        return {
-            "name": repo_obj.name,
-            "full_name": repo_obj.full_name,
-            "description": repo_obj.description,
-            "language": repo_obj.language,
-            "stars": repo_obj.stargazers_count,
-            "forks": repo_obj.forks_count,
-            "open_issues": repo_obj.open_issues_count,
-            "created_at": repo_obj.created_at,
-            "updated_at": repo_obj.updated_at,
-            "default_branch": repo_obj.default_branch
-        }
-    except GithubException as e:
+        repo_info = await fetch_repo_info(github_token, f"{owner}/{repo}")
+        response.headers["Cache-Control"] = REPO_INFO_CACHE_CONTROL
+        return repo_info
+    except HTTPException:
+        raise
+    except GithubRateLimitError as e:
+        raise rate_limit_http_exception(e)
+    except httpx.HTTPStatusError as e:
         raise HTTPException(status_code=404, detail=f"Repository not found: {e}")
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to get repository info: {str(e)}")
\ No newline at end of file
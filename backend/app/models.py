@@ -1,4 +1,5 @@
-from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey
+from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, JSON, Index
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 from .database import Base  # <-- relative import!
@@ -10,11 +11,15 @@ class User(Base):
 
 class ReviewHistory(Base):
     __tablename__ = "review_history"
+    # Serves the "recent reviews for a user" query as an index range scan
+    __table_args__ = (Index("ix_review_user_created", "user_id", "created_at"),)
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"))
     filename = Column(String)
     code = Column(Text)
-    review_result = Column(Text)  # Store as JSON string
+    review_result = Column(JSON().with_variant(JSONB(), "postgresql"), nullable=False)  # JSONB on PostgreSQL
     created_at = Column(DateTime(timezone=True), server_default=func.now())
 
-    user = relationship("User")
\ No newline at end of file
+    # Accessing it without an eager load raises instead of issuing one query per row;
+    # load it with selectinload()/joinedload() in the query that needs it
+    user = relationship("User", lazy="raise")
\ No newline at end of file
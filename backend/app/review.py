@@ -1,19 +1,314 @@
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
-from typing import List
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from fastapi.responses import StreamingResponse
+from pydantic import TypeAdapter
+from sqlalchemy import select, func
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List, Dict, Optional, Tuple, AsyncIterator
+from datetime import datetime, timezone
+import hashlib
+import gzip
+import threading
+import logging
+from collections import OrderedDict
 
 from app.models import ReviewHistory  # Adjust import as needed
-from app.schemas import ReviewHistoryResponse  # Adjust import as needed
-from app.database import get_db  # Adjust import as needed
+from app.schemas import (  # Adjust import as needed
+    ReviewHistoryResponse, ReviewHistorySummary, ReviewHistoryBatchRequest,
+)
+from app.database import AsyncSessionLocal, get_async_db, redis, redis_client  # Adjust import as needed
 
 router = APIRouter()
+logger = logging.getLogger(__name__)
 
-@router.get("/api/history", response_model=List[ReviewHistoryResponse])
-def get_history(user_id: int, db: Session = Depends(get_db)):
+HISTORY_CACHE_TTL = 60  # Seconds a serialized history body is served from Redis
+CODE_PREVIEW_LENGTH = 200  # Characters of code included with each listed review
+HISTORY_CACHE_CONTROL = "private, max-age=30"  # Per-user data, so browsers may cache it but shared proxies may not
+HISTORY_GZIP_LEVEL = 5  # Most of level 9's ratio on repetitive JSON at a fraction of the CPU
+HISTORY_STREAM_CHUNK_ROWS = 200  # Rows fetched from the cursor, and written to the client, at a time
+REVIEW_DETAIL_CACHE_MAX_BYTES = 64 * 1024 * 1024  # Total size of serialized reviews kept in process
+REVIEW_DETAIL_CACHE_MAX_ENTRY = 1024 * 1024  # Larger reviews are re-read from the database each time
+
+# Built once at import so each request reuses the compiled serializers
+_SUMMARY_LIST_ADAPTER = TypeAdapter(List[ReviewHistorySummary])
+
+# Reviews are never modified after they are written, so a serialized one stays valid
+_review_detail_cache = OrderedDict()  # (review_id, user_id) -> JSON bytes
+_review_detail_cache_bytes = 0
+_review_detail_lock = threading.Lock()
+
+def _get_cached_review(review_id: int, user_id: int) -> Optional[bytes]:
+    with _review_detail_lock:
+        key = (review_id, user_id)
+        if key not in _review_detail_cache:
+            return None
+        _review_detail_cache.move_to_end(key)
+        return _review_detail_cache[key]
+
+def _cache_review(review_id: int, user_id: int, payload: bytes):
+    # Bounded by bytes rather than entries, since a review's code can be megabytes
+    global _review_detail_cache_bytes
+    if len(payload) > REVIEW_DETAIL_CACHE_MAX_ENTRY:
+        return
+    key = (review_id, user_id)
+    with _review_detail_lock:
+        previous = _review_detail_cache.pop(key, None)
+        if previous is not None:
+            _review_detail_cache_bytes -= len(previous)
+        _review_detail_cache[key] = payload
+        _review_detail_cache_bytes += len(payload)
+        while _review_detail_cache_bytes > REVIEW_DETAIL_CACHE_MAX_BYTES:
+            _, evicted = _review_detail_cache.popitem(last=False)
+            _review_detail_cache_bytes -= len(evicted)
+
+# Each page has its own key and TTL, so writing one page never extends another's life.
+# A per-user set lists the page keys so they can all be invalidated together
+def _history_page_key(user_id: int, page: str) -> str:
+    return f"hist:{user_id}:{page}"
+
+def _history_index_key(user_id: int) -> str:
+    return f"hist:{user_id}:pages"
+
+async def _get_cached_history(user_id: int, page: str) -> Optional[Tuple[bytes, str]]:
+    """Return the cached (gzipped payload, etag) of a history page"""
+    if redis_client is None:
+        return None
+    try:
+        payload, etag = await redis_client.hmget(_history_page_key(user_id, page), ["body", "etag"])
+    except redis.RedisError:
+        # An unavailable cache falls back to the database
+        return None
+    if payload is None or etag is None:
+        return None
+    return payload, etag.decode()
+
+async def _cache_history(user_id: int, page: str, compressed: bytes, etag: str):
+    if redis_client is None:
+        return
+    key = _history_page_key(user_id, page)
+    index_key = _history_index_key(user_id)
+    try:
+        await (
+            redis_client.pipeline()
+            .hset(key, mapping={"body": compressed, "etag": etag})
+            .expire(key, HISTORY_CACHE_TTL)
+            .sadd(index_key, key)
+            # Outlives every page it lists; members whose page already expired are harmless
+            .expire(index_key, HISTORY_CACHE_TTL)
+            .execute()
+        )
+    except redis.RedisError:
+        pass
+
+def _epoch_seconds(value: datetime) -> int:
+    # SQLite hands back naive timestamps; CURRENT_TIMESTAMP is UTC
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return int(value.timestamp())
+
+def _make_etag(payload: bytes) -> str:
+    # Weak, since the gzip and identity encodings of the body share it
+    return 'W/"' + hashlib.blake2b(payload, digest_size=16).hexdigest() + '"'
+
+def _json_response_with_etag(request: Request, compressed: bytes, etag: str) -> Response:
+    """Answer with 304 when the client already holds this exact body.
+    
+    The body is kept gzipped, so clients that accept gzip get the stored bytes
+    as they are and GZipMiddleware leaves the response alone.
+    """
+    headers = {"ETag": etag, "Cache-Control": HISTORY_CACHE_CONTROL, "Vary": "Accept-Encoding"}
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match:
+        # Weak comparison, as RFC 9110 requires for If-None-Match
+        candidates = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+        if etag.removeprefix("W/") in candidates or "*" in candidates:
+            return Response(status_code=304, headers=headers)
+    if "gzip" in request.headers.get("accept-encoding", ""):
+        headers["Content-Encoding"] = "gzip"
+        return Response(compressed, media_type="application/json", headers=headers)
+    return Response(gzip.decompress(compressed), media_type="application/json", headers=headers)
+
+async def invalidate_history_cache(user_id: int):
+    """Drop the cached history for a user; call after writing a ReviewHistory row for them"""
+    if redis_client is None:
+        return
+    index_key = _history_index_key(user_id)
+    try:
+        page_keys = await redis_client.smembers(index_key)
+        await redis_client.delete(index_key, *page_keys)
+    except redis.RedisError:
+        pass
+
+# The body is encoded by hand, so the schema is declared for the OpenAPI docs only
+@router.get("/api/history", responses={200: {"model": List[ReviewHistorySummary]}})
+async def get_history(
+    request: Request,
+    user_id: int,
+    limit: int = Query(50, ge=1, le=200),
+    offset: int = Query(0, ge=0),
+    db: AsyncSession = Depends(get_async_db),
+):
+    """
+    Returns a page of the code review history for the given user, newest first.
+    Each entry carries a short code preview; the full code and review results are
+    fetched per review from /api/history/{review_id}. A user without reviews gets an empty list.
+    """
+    page = f"{limit}:{offset}"
+    cached = await _get_cached_history(user_id, page)
+    if cached is not None:
+        # Both the 304 check and the body come from the cache, without touching the database
+        compressed, etag = cached
+        return _json_response_with_etag(request, compressed, etag)
+    
+    # Only the listed columns are read, and the (user_id, created_at) index serves
+    # the filter, the ordering and the limit without sorting the user's rows
+    history = (await db.execute(
+        select(
+            ReviewHistory.id,
+            ReviewHistory.filename,
+            ReviewHistory.created_at,
+            # Cut on the database side so the full code column never leaves it
+            func.substr(ReviewHistory.code, 1, CODE_PREVIEW_LENGTH).label("code_preview"),
+        )
+        .where(ReviewHistory.user_id == user_id)
+        .order_by(ReviewHistory.created_at.desc())
+        .limit(limit)
+        .offset(offset)
+    )).all()
+    # Rows come straight from the database, so build the models without re-validating them
+    # and let pydantic-core serialize the whole list in one call
+    items = [
+        ReviewHistorySummary.model_construct(
+            id=row.id,
+            filename=row.filename,
+            created_at=_epoch_seconds(row.created_at),
+            code_preview=row.code_preview or "",
+        )
+        for row in history
+    ]
+    payload = _SUMMARY_LIST_ADAPTER.dump_json(items, by_alias=True)
+    etag = _make_etag(payload)
+    # Compressed once here rather than by the middleware on every cache hit
+    compressed = gzip.compress(payload, compresslevel=HISTORY_GZIP_LEVEL)
+    await _cache_history(user_id, page, compressed, etag)
+    return _json_response_with_etag(request, compressed, etag)
+
+def _history_batch_statement(user_ids: List[int], limit: int):
+    # Rank each user's reviews in the database so only the newest `limit` per user are read
+    ranked = (
+        select(
+            ReviewHistory.user_id,
+            ReviewHistory.id,
+            ReviewHistory.filename,
+            ReviewHistory.created_at,
+            func.substr(ReviewHistory.code, 1, CODE_PREVIEW_LENGTH).label("code_preview"),
+            func.row_number().over(
+                partition_by=ReviewHistory.user_id,
+                order_by=ReviewHistory.created_at.desc(),
+            ).label("rank"),
+        )
+        .where(ReviewHistory.user_id.in_(user_ids))
+        .subquery()
+    )
+    return (
+        select(ranked)
+        .where(ranked.c.rank <= limit)
+        .order_by(ranked.c.user_id, ranked.c.created_at.desc())
+        .execution_options(yield_per=HISTORY_STREAM_CHUNK_ROWS)
+    )
+
+async def _stream_history_batch(db: AsyncSession, first: Optional[list], rest: AsyncIterator[list],
+                                user_ids: List[int]) -> AsyncIterator[bytes]:
+    """Encode the batch as a JSON object while rows are still arriving from the database"""
+    pending = dict.fromkeys(user_ids)  # Users with nothing written yet
+    current = None
+    try:
+        yield b"{"
+        rows = first
+        while rows is not None:
+            chunk = bytearray()
+            for row in rows:
+                if row.user_id == current:
+                    chunk += b","
+                else:
+                    if current is not None:
+                        chunk += b"],"
+                    current = row.user_id
+                    pending.pop(current, None)
+                    chunk += b'"%d":[' % current
+                chunk += ReviewHistorySummary.model_construct(
+                    id=row.id,
+                    filename=row.filename,
+                    created_at=_epoch_seconds(row.created_at),
+                    code_preview=row.code_preview or "",
+                ).model_dump_json(by_alias=True).encode()
+            yield bytes(chunk)
+            rows = await anext(rest, None)
+    except Exception as e:
+        # The status line is already sent, so the stream just ends early
+        logger.error(f"Error streaming review history for users {user_ids}: {str(e)}")
+        return
+    finally:
+        await db.close()
+    
+    # Users without reviews map to an empty list
+    entries = [b'"%d":[]' % user_id for user_id in pending]
+    if current is not None:
+        entries.insert(0, b"")  # Follows the last user's list, which is still open
+        yield b"]"
+    yield b",".join(entries) + b"}"
+
+@router.post("/api/history/batch", responses={200: {"model": Dict[int, List[ReviewHistorySummary]]}})
+async def get_history_batch(request: ReviewHistoryBatchRequest):
+    """
+    Returns the newest reviews of several users in one query, keyed by user id.
+    Users without reviews map to an empty list.
+    """
+    # The request's own session is closed before a streamed body is sent, so open one
+    # that the stream closes when it is done
+    db = AsyncSessionLocal()
+    try:
+        # A server-side cursor keeps memory at one chunk of rows however large the batch
+        result = await db.stream(_history_batch_statement(request.user_ids, request.limit))
+        partitions = result.partitions()
+        # Wait for the first rows here so database errors still get a proper status code
+        first = await anext(partitions, None)
+    except Exception as e:
+        await db.close()
+        logger.error(f"Error loading review history for users {request.user_ids}: {str(e)}")
+        raise HTTPException(status_code=500, detail="Failed to load review history.")
+    return StreamingResponse(
+        _stream_history_batch(db, first, partitions, request.user_ids),
+        media_type="application/json"
+    )
+
+@router.get("/api/history/{review_id}", responses={200: {"model": ReviewHistoryResponse}})
+async def get_history_item(review_id: int, user_id: int, db: AsyncSession = Depends(get_async_db)):
     """
-    Returns the code review history for the given user.
+    Returns one review of the given user, including its code and review results.
     """
-    history = db.query(ReviewHistory).filter(ReviewHistory.user_id == user_id).order_by(ReviewHistory.created_at.desc()).all()
-    if history is None:
-        raise HTTPException(status_code=404, detail="No review history found for this user.")
-    return history
\ No newline at end of file
+    payload = _get_cached_review(review_id, user_id)
+    if payload is not None:
+        return Response(payload, media_type="application/json")
+    
+    row = (await db.execute(
+        select(
+            ReviewHistory.id,
+            ReviewHistory.filename,
+            ReviewHistory.code,
+            ReviewHistory.review_result,
+            ReviewHistory.created_at,
+        )
+        .where(ReviewHistory.id == review_id, ReviewHistory.user_id == user_id)
+    )).first()
+    if row is None:
+        raise HTTPException(status_code=404, detail="Review not found.")
+    item = ReviewHistoryResponse.model_construct(
+        id=row.id,
+        filename=row.filename,
+        code=row.code,
+        review_result=row.review_result,
+        created_at=_epoch_seconds(row.created_at),
+    )
+    payload = item.model_dump_json(by_alias=True).encode()
+    _cache_review(review_id, user_id, payload)
+    return Response(payload, media_type="application/json")
@@ -1,10 +1,25 @@
-from pydantic import BaseModel
-from typing import List, Optional
-from datetime import datetime
+from pydantic import BaseModel, ConfigDict, Field
+from typing import List, Optional, Any
 
 class ReviewHistoryResponse(BaseModel):
+    model_config = ConfigDict(frozen=True)
+    
     id: int
     filename: str
     code: str
-    review_result: str
-    created_at: datetime
\ No newline at end of file
+    review_result: Any  # Decoded JSON, stored natively by the database
+    created_at: int  # Unix epoch seconds; cheaper to encode than an ISO timestamp
+
+class ReviewHistorySummary(BaseModel):
+    model_config = ConfigDict(frozen=True)
+    
+    id: int
+    filename: str
+    created_at: int  # Unix epoch seconds
+    code_preview: str  # Leading characters of the code
+
+MAX_HISTORY_BATCH_USERS = 32
+
+class ReviewHistoryBatchRequest(BaseModel):
+    user_ids: List[int] = Field(..., min_length=1, max_length=MAX_HISTORY_BATCH_USERS)
+    limit: int = Field(50, ge=1, le=200)  # Reviews returned per user
@@ -1,16 +1,33 @@
 import React, { useEffect, useState } from "react";
 import axios from "axios";
-import { Box, Heading, Text, Spinner } from "@chakra-ui/react";
+import { Box, Button, Heading, Text, Spinner } from "@chakra-ui/react";
 import CopyButton from "../components/CopyButton";
 
 type Review = {
   id: number;
   filename: string;
-  created_at: string;
+  created_at: number; // Unix epoch seconds
+  code_preview: string;
+};
+
+// The list only carries summaries; code and results are loaded per review
+type ReviewDetail = Review & {
   code: string;
-  review_result: string;
+  review_result: unknown;
 };
 
+// review_result is stored as JSON, so it may arrive as an object rather than text
+const formatReviewResult = (result: unknown): string =>
+  typeof result === "string" ? result : JSON.stringify(result, null, 2);
+
+// Reviews requested per page; the API returns newest first
+const PAGE_SIZE = 50;
+
+const fetchHistoryPage = (userId: number | string, offset: number) =>
+  axios.get<Review[]>(
+    `/api/history?user_id=${userId}&limit=${PAGE_SIZE}&offset=${offset}`
+  );
+
 type HistoryProps = {
   userId: number | string | null;
 };
@@ -19,6 +36,40 @@ const History: React.FC<HistoryProps> = ({ userId }) => {
   const [history, setHistory] = useState<Review[]>([]);
   const [loading, setLoading] = useState(true);
   const [error, setError] = useState<string | null>(null);
+  const [details, setDetails] = useState<Record<number, ReviewDetail>>({});
+  const [loadingDetailId, setLoadingDetailId] = useState<number | null>(null);
+  const [hasMore, setHasMore] = useState(false);
+  const [loadingMore, setLoadingMore] = useState(false);
+
+  const loadMore = async () => {
+    if (!userId) return;
+    setLoadingMore(true);
+    try {
+      const response = await fetchHistoryPage(userId, history.length);
+      setHistory((prev) => [...prev, ...response.data]);
+      setHasMore(response.data.length === PAGE_SIZE);
+    } catch (err) {
+      console.error("Failed to fetch history:", err);
+      setError("Failed to load history. Please try again.");
+    } finally {
+      setLoadingMore(false);
+    }
+  };
+
+  const loadDetails = async (reviewId: number) => {
+    setLoadingDetailId(reviewId);
+    try {
+      const response = await axios.get<ReviewDetail>(
+        `/api/history/${reviewId}?user_id=${userId}`
+      );
+      setDetails((prev) => ({ ...prev, [reviewId]: response.data }));
+    } catch (err) {
+      console.error("Failed to fetch review:", err);
+      setError("Failed to load review. Please try again.");
+    } finally {
+      setLoadingDetailId(null);
+    }
+  };
 
   useEffect(() => {
     if (!userId) {
@@ -31,10 +82,10 @@ const History: React.FC<HistoryProps> = ({ userId }) => {
       setError(null);
 
       try {
-        const response = await axios.get<Review[]>(
-          `/api/history?user_id=${userId}`
-        );
+        const response = await fetchHistoryPage(userId, 0);
         setHistory(response.data);
+        // A full page means there may be older reviews to load
+        setHasMore(response.data.length === PAGE_SIZE);
       } catch (err) {
         console.error("Failed to fetch history:", err);
         setError("Failed to load history. Please try again.");
@@ -115,62 +166,98 @@ const History: React.FC<HistoryProps> = ({ userId }) => {
               <Text as="span" fontWeight="bold">
                 Date:
               </Text>{" "}
-              {new Date(review.created_at).toLocaleString()}
+              {new Date(review.created_at * 1000).toLocaleString()}
             </Text>
           </Box>
 
-          <Box mb={4}>
-            <Text fontWeight="bold" mb={2} color="green.600">
-              Code:
-            </Text>
-            <Box position="relative">
-              <Box
-                as="pre"
-                bg="gray.50"
-                borderRadius="md"
-                p={4}
-                overflowX="auto"
-                fontSize="sm"
-                fontFamily="mono"
-                border="1px solid"
-                borderColor="gray.200"
-                maxH="300px"
-              >
-                {review.code}
-              </Box>
-              <Box position="absolute" top={2} right={2}>
-                <CopyButton value={review.code} />
+          {details[review.id] ? (
+            <>
+              <Box mb={4}>
+                <Text fontWeight="bold" mb={2} color="green.600">
+                  Code:
+                </Text>
+                <Box position="relative">
+                  <Box
+                    as="pre"
+                    bg="gray.50"
+                    borderRadius="md"
+                    p={4}
+                    overflowX="auto"
+                    fontSize="sm"
+                    fontFamily="mono"
+                    border="1px solid"
+                    borderColor="gray.200"
+                    maxH="300px"
+                  >
+                    {details[review.id].code}
+                  </Box>
+                  <Box position="absolute" top={2} right={2}>
+                    <CopyButton value={details[review.id].code} />
+                  </Box>
+                </Box>
               </Box>
-            </Box>
-          </Box>
 
-          <Box>
-            <Text fontWeight="bold" mb={2} color="purple.600">
-              Review Results:
-            </Text>
-            <Box position="relative">
+              <Box>
+                <Text fontWeight="bold" mb={2} color="purple.600">
+                  Review Results:
+                </Text>
+                <Box position="relative">
+                  <Box
+                    as="pre"
+                    bg="gray.50"
+                    borderRadius="md"
+                    p={4}
+                    overflowX="auto"
+                    fontSize="sm"
+                    fontFamily="mono"
+                    border="1px solid"
+                    borderColor="gray.200"
+                    maxH="300px"
+                    whiteSpace="pre-wrap"
+                  >
+                    {formatReviewResult(details[review.id].review_result)}
+                  </Box>
+                  <Box position="absolute" top={2} right={2}>
+                    <CopyButton value={formatReviewResult(details[review.id].review_result)} />
+                  </Box>
+                </Box>
+              </Box>
+            </>
+          ) : (
+            <>
               <Box
                 as="pre"
                 bg="gray.50"
                 borderRadius="md"
                 p={4}
+                mb={4}
                 overflowX="auto"
                 fontSize="sm"
                 fontFamily="mono"
                 border="1px solid"
                 borderColor="gray.200"
-                maxH="300px"
-                whiteSpace="pre-wrap"
+                color="gray.600"
               >
-                {review.review_result}
-              </Box>
-              <Box position="absolute" top={2} right={2}>
-                <CopyButton value={review.review_result} />
+                {review.code_preview}
               </Box>
-            </Box>
-          </Box>
+              <Button
+                size="sm"
+                onClick={() => loadDetails(review.id)}
+                isLoading={loadingDetailId === review.id}
+              >
+                Show code and results
+              </Button>
+            </>
+          )}
         </Box>
       ))}
+      {hasMore && (
+        <Box textAlign="center">
+          <Button onClick={loadMore} isLoading={loadingMore}>
+            Load older reviews
+          </Button>
+        </Box>
+      )}
     </Box>
   );
 };